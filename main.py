@@ -3,14 +3,12 @@ Main application for the Company Data Extraction System.
 """
 import sys
 import os
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from utils.config import Config, create_sample_env_file
-from agents.company_agent import CompanyAgent
-from database.models import DatabaseManager
 from models.company import DatabaseConfig
 
 
@@ -31,6 +29,10 @@ class CompanyExtractionSystem:
     
     def _init_database(self):
         """Initialize database connection and create tables."""
+        # SQLAlchemy and LangChain are imported on initialization rather than at startup,
+        # so the .env and configuration checks in main() stay fast
+        from database.models import DatabaseManager
+        
         try:
             self.db_manager = DatabaseManager(self.config.database_config.connection_string)
             self.db_manager.create_tables()
@@ -41,11 +43,15 @@ class CompanyExtractionSystem:
     
     def _init_agent(self):
         """Initialize the intelligent agent."""
+        from agents.company_agent import CompanyAgent
+        
         try:
             self.agent = CompanyAgent(
                 openai_api_key=self.config.openai_api_key,
                 db_config=self.config.database_config,
-                model_name=self.config.model_name
+                model_name=self.config.model_name,
+                max_concurrency=self.config.max_concurrency,
+                db_manager=self.db_manager
             )
             print("Agent initialized successfully")
         except Exception as e:
@@ -60,25 +66,34 @@ class CompanyExtractionSystem:
         """Run the agent with user input."""
         return self.agent.run_agent(user_input)
     
-    def extract_with_streaming(self, text: str):
-        """Extract company information with streaming support."""
+    def extract_with_streaming(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """Extract company information with streaming support, as an async iterator of per-company events."""
         return self.agent.extract_with_streaming(text)
     
     def batch_process(self, texts: List[str]) -> List[str]:
         """Process multiple texts in batch."""
         return self.agent.batch_process(texts)
     
+    def batch_process_offline(self, texts: List[str]) -> List[str]:
+        """Process multiple texts through the OpenAI Batch API."""
+        return self.agent.batch_process_offline(texts)
+    
+    # These commands map to a known tool, so they query the database directly
+    # instead of paying an LLM round trip for the agent to pick that tool
     def get_database_stats(self) -> str:
         """Get database statistics."""
-        return self.agent.run_agent("Get database statistics")
+        from agents.company_agent import describe_statistics
+        return describe_statistics(self.agent.db_manager)
     
     def search_companies(self, search_term: str) -> str:
         """Search for companies."""
-        return self.agent.run_agent(f"Search for companies matching '{search_term}'")
+        from agents.company_agent import describe_search_results
+        return describe_search_results(self.agent.db_manager, search_term)
     
     def list_companies(self, limit: int = 10) -> str:
         """List companies in the database."""
-        return self.agent.run_agent(f"List {limit} companies from the database")
+        from agents.company_agent import describe_company_list
+        return describe_company_list(self.agent.db_manager, limit=limit)
 
 
 def main():
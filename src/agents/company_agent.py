@@ -1,41 +1,201 @@
 """
 Intelligent Agent for coordinating company data extraction and database operations.
 """
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Pattern, Tuple
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain.agents import AgentExecutor, create_openai_tools_agent
 
 from extractors.company_extractor import CompanyExtractor
 from database.operations import CompanyDatabaseOperations
-from database.models import DatabaseManager
+from database.models import DatabaseManager, CompanyRow
 from models.company import CompanyData, ExtractedData, DatabaseConfig
+from utils.cache import SemanticResponseCache
+from utils.event_loop import run_sync
+
+# Built once at import and shared by every CompanyAgent
+AGENT_PROMPT = ChatPromptTemplate.from_template("""
+You are an intelligent agent specialized in extracting and managing company information from text.
+
+Your capabilities include:
+1. Extracting company details (names, founding dates, founders) from text using LCEL framework
+2. Storing extracted data in PostgreSQL database
+3. Searching and retrieving company information
+4. Providing database statistics
+
+When a user asks you to process text or perform database operations, use the appropriate tools.
+Always provide clear, helpful responses and explain what you're doing.
+
+User request: {input}
+
+{agent_scratchpad}
+""")
+
+# Deterministic requests answered straight from the database, skipping the LLM agent
+LIST_INTENT = re.compile(
+    r"^\s*(?:list|show)\s+(?:all\s+)?(?:(?P<limit>[1-9]\d*)\s+)?(?:the\s+)?companies\s*[.?!]?\s*$",
+    re.I
+)
+SEARCH_INTENT = re.compile(
+    r"^\s*(?:search|find)\s+(?:for\s+)?(?:companies\s+)?(?:(?:matching|named|called|founded\s+by)\s+)?"
+    r"['\"]?(?P<term>[^'\"]+?)['\"]?\s*[.?!]?\s*$",
+    re.I
+)
+DETAILS_INTENT = re.compile(
+    r"^\s*(?:get\s+|show\s+)?details\s+(?:about|for|of)\s+['\"]?(?P<name>[^'\"]+?)['\"]?\s*[.?!]?\s*$",
+    re.I
+)
+STATS_INTENT = re.compile(
+    r"^\s*(?:get\s+|show\s+)?(?:the\s+)?(?:database\s+)?(?:stats|statistics)\s*[.?!]?\s*$",
+    re.I
+)
+
+# Words and separators that mark a search term or company name as a question rather than a single
+# entity ("founded after 2000", "the founders of Apple", "Apple and Microsoft", or just "companies");
+# those go to the agent
+AMBIGUOUS_ENTITY_RE = re.compile(
+    r"\b(?:compan(?:y|ies)|founded|founders?|founding|after|before|since|between|during|and|or|not|which|who|whom|what|"
+    r"when|where|why|how|the|out|with|without|that|than|in|from|by|all|any|every|no)\b|[,;&]",
+    re.I
+)
+INTENT_PATTERNS: List[Tuple[str, Pattern]] = [
+    ("list", LIST_INTENT),
+    ("search", SEARCH_INTENT),
+    ("details", DETAILS_INTENT),
+    ("stats", STATS_INTENT),
+]
+
+
+def match_intent(user_input: str) -> Optional[Tuple[str, re.Match]]:
+    """Return the (intent, match) for a request that can skip the agent, or None if it needs the LLM."""
+    for intent, pattern in INTENT_PATTERNS:
+        match = pattern.match(user_input)
+        if match is None:
+            continue
+        
+        # Route only a single entity; anything ambiguous falls through to the agent
+        groups = match.groupdict()
+        entity = groups.get("term") or groups.get("name")
+        if entity is not None and AMBIGUOUS_ENTITY_RE.search(entity):
+            return None
+        return intent, match
+    return None
+
+
+def _format_company_entry(company: CompanyRow) -> str:
+    """Format one company as a list entry."""
+    entry = f"- {company.company_name} (ID: {company.id})\n"
+    if company.founded_by:
+        entry += f"  Founded by: {', '.join(company.founded_by)}\n"
+    if company.founded_in:
+        entry += f"  Founded: {company.founded_in}\n"
+    return entry + "\n"
+
+
+def describe_search_results(db_ops: CompanyDatabaseOperations, search_term: str, fuzzy: bool = False) -> str:
+    """Search companies by name or founder and describe the matches."""
+    try:
+        # Format rows as they stream in rather than materializing the result set
+        entries = [_format_company_entry(company) for company in db_ops.search_companies(search_term, fuzzy=fuzzy)]
+        if not entries:
+            return f"No companies found matching '{search_term}'"
+        
+        return f"Found {len(entries)} companies matching '{search_term}':\n" + "".join(entries)
+    except Exception as e:
+        return f"Error searching companies: {str(e)}"
+
+
+def describe_company(db_ops: CompanyDatabaseOperations, company_name: str) -> str:
+    """Describe a single company looked up by name."""
+    try:
+        company = db_ops.get_company_by_name(company_name)
+        if not company:
+            return f"Company '{company_name}' not found in database."
+        
+        result = f"Company Details for '{company.company_name}':\n"
+        result += f"ID: {company.id}\n"
+        result += f"Name: {company.company_name}\n"
+        if company.founded_in:
+            result += f"Founded: {company.founded_in}\n"
+        if company.founded_by:
+            result += f"Founded by: {', '.join(company.founded_by)}\n"
+        result += f"Created: {company.created_at}\n"
+        result += f"Updated: {company.updated_at}\n"
+        
+        return result
+    except Exception as e:
+        return f"Error getting company details: {str(e)}"
+
+
+def describe_statistics(db_ops: CompanyDatabaseOperations) -> str:
+    """Describe database statistics."""
+    try:
+        stats = db_ops.get_statistics()
+        result = "Database Statistics:\n"
+        result += f"Total Companies: {stats['total_companies']}\n"
+        result += f"Total Founders: {stats['total_founders']}\n"
+        result += f"Companies with Founding Dates: {stats['companies_with_founding_dates']}\n"
+        result += f"Companies without Founding Dates: {stats['companies_without_founding_dates']}\n"
+        
+        return result
+    except Exception as e:
+        return f"Error getting database statistics: {str(e)}"
+
+
+def describe_company_list(db_ops: CompanyDatabaseOperations, limit: int = 10) -> str:
+    """Describe up to limit companies from the database."""
+    try:
+        entries = [_format_company_entry(company) for company in db_ops.get_all_companies(limit=limit)]
+        if not entries:
+            return "No companies found in database."
+        
+        return f"Listing {len(entries)} companies:\n" + "".join(entries)
+    except Exception as e:
+        return f"Error listing companies: {str(e)}"
 
 
 class CompanyAgent:
     """Intelligent agent for company data extraction and database management."""
     
-    def __init__(self, openai_api_key: str, db_config: DatabaseConfig, model_name: str = "gpt-3.5-turbo"):
+    def __init__(self, openai_api_key: str, db_config: DatabaseConfig, model_name: str = "gpt-3.5-turbo",
+                 max_concurrency: int = 10, db_manager: Optional[DatabaseManager] = None):
         """Initialize the agent with OpenAI API key and database configuration."""
+        # The LangChain agent and OpenAI modules are slow to import, so load them only when an
+        # agent is built; the describe_* helpers in this module don't need them
+        from langchain.agents import AgentExecutor
+        from langchain_openai import OpenAIEmbeddings
+        
         self.openai_api_key = openai_api_key
         self.db_config = db_config
+        self.max_concurrency = max_concurrency
         
         # Initialize components
-        self.extractor = CompanyExtractor(openai_api_key, model_name)
+        self.extractor = CompanyExtractor(openai_api_key, model_name, max_concurrency=max_concurrency)
+        # Reuse the caller's DatabaseManager (and its connection pool) when given
         self.db_manager = CompanyDatabaseOperations(
-            DatabaseManager(db_config.connection_string)
+            db_manager or DatabaseManager(db_config.connection_string)
         )
         
-        # Initialize LLM for agent
-        self.llm = ChatOpenAI(
-            api_key=openai_api_key,
-            model=model_name,
-            temperature=0.1
+        # Reuse the extractor's chat model (same key, model and temperature) for the agent
+        self.llm = self.extractor.llm
+        
+        # Cache agent responses to repeated/near-duplicate inputs
+        self.response_cache = SemanticResponseCache(
+            OpenAIEmbeddings(api_key=openai_api_key, model="text-embedding-3-small"),
+            threshold=0.95
         )
         
+        # Route trivial requests directly to tools before falling back to the LLM agent
+        self.intent_routes: Dict[str, Callable[[re.Match], str]] = {
+            "list": lambda m: describe_company_list(self.db_manager, limit=int(m["limit"] or 10)),
+            "search": lambda m: describe_search_results(self.db_manager, m["term"]),
+            "details": lambda m: describe_company(self.db_manager, m["name"]),
+            "stats": lambda m: describe_statistics(self.db_manager),
+        }
+        
         # Create tools
         self.tools = self._create_tools()
         
@@ -83,89 +243,31 @@ class CompanyAgent:
                 
                 # Store in database
                 results = self.db_manager.insert_extracted_data(extracted_data)
+                self.response_cache.clear()
                 
                 return f"Successfully stored {results['successful_inserts']} companies. Failed: {results['failed_inserts']}. Company IDs: {results['inserted_ids']}"
             except Exception as e:
                 return f"Error storing company data: {str(e)}"
         
         @tool
-        def search_companies(search_term: str) -> str:
-            """Search for companies by name or founder."""
-            try:
-                companies = self.db_manager.search_companies(search_term)
-                if not companies:
-                    return f"No companies found matching '{search_term}'"
-                
-                result = f"Found {len(companies)} companies matching '{search_term}':\n"
-                for company in companies:
-                    result += f"- {company['company_name']} (ID: {company['id']})\n"
-                    if company['founded_by']:
-                        result += f"  Founded by: {', '.join(company['founded_by'])}\n"
-                    if company['founded_in']:
-                        result += f"  Founded: {company['founded_in']}\n"
-                    result += "\n"
-                
-                return result
-            except Exception as e:
-                return f"Error searching companies: {str(e)}"
+        def search_companies(search_term: str, fuzzy: bool = False) -> str:
+            """Search for companies by name or founder. Set fuzzy to true to tolerate misspelled company names."""
+            return describe_search_results(self.db_manager, search_term, fuzzy=fuzzy)
         
         @tool
         def get_company_details(company_name: str) -> str:
             """Get detailed information about a specific company."""
-            try:
-                company = self.db_manager.get_company_by_name(company_name)
-                if not company:
-                    return f"Company '{company_name}' not found in database."
-                
-                result = f"Company Details for '{company['company_name']}':\n"
-                result += f"ID: {company['id']}\n"
-                result += f"Name: {company['company_name']}\n"
-                if company['founded_in']:
-                    result += f"Founded: {company['founded_in']}\n"
-                if company['founded_by']:
-                    result += f"Founded by: {', '.join(company['founded_by'])}\n"
-                result += f"Created: {company['created_at']}\n"
-                result += f"Updated: {company['updated_at']}\n"
-                
-                return result
-            except Exception as e:
-                return f"Error getting company details: {str(e)}"
+            return describe_company(self.db_manager, company_name)
         
         @tool
         def get_database_statistics() -> str:
             """Get statistics about the database."""
-            try:
-                stats = self.db_manager.get_statistics()
-                result = "Database Statistics:\n"
-                result += f"Total Companies: {stats['total_companies']}\n"
-                result += f"Total Founders: {stats['total_founders']}\n"
-                result += f"Companies with Founding Dates: {stats['companies_with_founding_dates']}\n"
-                result += f"Companies without Founding Dates: {stats['companies_without_founding_dates']}\n"
-                
-                return result
-            except Exception as e:
-                return f"Error getting database statistics: {str(e)}"
+            return describe_statistics(self.db_manager)
         
         @tool
         def list_all_companies(limit: int = 10) -> str:
             """List all companies in the database with optional limit."""
-            try:
-                companies = self.db_manager.get_all_companies(limit=limit)
-                if not companies:
-                    return "No companies found in database."
-                
-                result = f"Listing {len(companies)} companies:\n"
-                for company in companies:
-                    result += f"- {company['company_name']} (ID: {company['id']})\n"
-                    if company['founded_by']:
-                        result += f"  Founded by: {', '.join(company['founded_by'])}\n"
-                    if company['founded_in']:
-                        result += f"  Founded: {company['founded_in']}\n"
-                    result += "\n"
-                
-                return result
-            except Exception as e:
-                return f"Error listing companies: {str(e)}"
+            return describe_company_list(self.db_manager, limit=limit)
         
         return [
             extract_company_data,
@@ -178,58 +280,136 @@ class CompanyAgent:
     
     def _create_agent(self):
         """Create the agent with tools."""
-        prompt = ChatPromptTemplate.from_template("""
-        You are an intelligent agent specialized in extracting and managing company information from text.
-        
-        Your capabilities include:
-        1. Extracting company details (names, founding dates, founders) from text using LCEL framework
-        2. Storing extracted data in PostgreSQL database
-        3. Searching and retrieving company information
-        4. Providing database statistics
-        
-        When a user asks you to process text or perform database operations, use the appropriate tools.
-        Always provide clear, helpful responses and explain what you're doing.
-        
-        User request: {input}
-        
-        {agent_scratchpad}
-        """)
-        
-        return create_openai_tools_agent(self.llm, self.tools, prompt)
+        from langchain.agents import create_openai_tools_agent
+        return create_openai_tools_agent(self.llm, self.tools, AGENT_PROMPT)
     
     def process_text(self, text: str) -> str:
         """Process text to extract and store company information."""
         try:
-            # First extract the data
-            extracted_data = self.extractor.extract_from_text(text)
+            found, successful, failed = run_sync(self._aprocess_text_streaming(text))
             
-            if extracted_data.total_companies == 0:
+            if found == 0:
                 return "No company information found in the provided text."
             
-            # Store in database
-            results = self.db_manager.insert_extracted_data(extracted_data)
-            
-            return f"Successfully processed text and found {extracted_data.total_companies} companies. Stored {results['successful_inserts']} companies in database. Failed: {results['failed_inserts']}"
+            return f"Successfully processed text and found {found} companies. Stored {successful} companies in database. Failed: {failed}"
             
         except Exception as e:
             return f"Error processing text: {str(e)}"
     
+    async def _aprocess_text_streaming(self, text: str, batch_size: int = 10,
+                                       flush_interval: float = 0.5) -> Tuple[int, int, int]:
+        """Stream companies out of the LLM and upsert them while extraction continues.
+        
+        A writer task drains the queue in batches of up to batch_size companies (or
+        whatever arrived within flush_interval seconds), so database writes overlap
+        with generation. Returns (found, stored, failed) counts.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        counts = {"found": 0, "successful": 0, "failed": 0}
+        
+        async def writer():
+            finished = False
+            while not finished:
+                company = await queue.get()
+                if company is None:
+                    break
+                
+                batch = ExtractedData()
+                batch.add_company(company)
+                deadline = loop.time() + flush_interval
+                while batch.total_companies < batch_size:
+                    try:
+                        company = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                    except asyncio.TimeoutError:
+                        break
+                    if company is None:
+                        finished = True
+                        break
+                    batch.add_company(company)
+                
+                # The database driver is blocking, so write from a worker thread
+                results = await asyncio.to_thread(self.db_manager.insert_extracted_data_bulk, batch)
+                counts["successful"] += results["successful_inserts"]
+                counts["failed"] += results["failed_inserts"]
+        
+        writer_task = asyncio.create_task(writer())
+        try:
+            async for company in self.extractor.astream_companies(text):
+                counts["found"] += 1
+                await queue.put(company)
+        finally:
+            await queue.put(None)
+            await writer_task
+            self.response_cache.clear()
+        
+        return counts["found"], counts["successful"], counts["failed"]
+    
     def run_agent(self, user_input: str) -> str:
-        """Run the agent with user input."""
+        """Run the agent with user input, reusing cached responses for repeated questions."""
         try:
+            routed = match_intent(user_input)
+            if routed is not None:
+                intent, match = routed
+                return self.intent_routes[intent](match)
+            
+            cached_response = self.response_cache.lookup(user_input)
+            if cached_response is not None:
+                return cached_response
+            
             result = self.agent_executor.invoke({"input": user_input})
+            self.response_cache.update(user_input, result["output"])
             return result["output"]
         except Exception as e:
             return f"Error running agent: {str(e)}"
     
-    def extract_with_streaming(self, text: str):
-        """Extract company information with streaming support."""
+    def extract_with_streaming(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """Extract company information with streaming support, as an async iterator of per-company events."""
         return self.extractor.extract_with_streaming(text)
     
+    async def _aprocess_texts(self, texts: List[str]) -> List[Any]:
+        """Extract company information from all texts concurrently, once per distinct text."""
+        # The extractor caps in-flight LLM calls across every paragraph of every text
+        unique_texts = list(dict.fromkeys(texts))
+        tasks = [self.extractor.aextract_from_text(text) for text in unique_texts]
+        results = dict(zip(unique_texts, await asyncio.gather(*tasks, return_exceptions=True)))
+        return [results[text] for text in texts]
+    
     def batch_process(self, texts: List[str]) -> List[str]:
-        """Process multiple texts in batch."""
-        results = []
-        for text in texts:
-            result = self.process_text(text)
-            results.append(result)
-        return results 
\ No newline at end of file
+        """Process multiple texts in batch, extracting concurrently and storing in one transaction."""
+        extractions = run_sync(self._aprocess_texts(texts))
+        return self._store_extractions(extractions)
+    
+    def batch_process_offline(self, texts: List[str]) -> List[str]:
+        """Process multiple texts through the OpenAI Batch API and store them in one transaction."""
+        try:
+            extractions = self.extractor.batch_extract_offline(texts)
+        except Exception as e:
+            return [f"Error processing text: {str(e)}" for _ in texts]
+        
+        return self._store_extractions(extractions)
+    
+    def _store_extractions(self, extractions: List[Any]) -> List[str]:
+        """Store every extraction in a single bulk insert and summarize each text's outcome."""
+        # Combine every extraction so the database sees a single bulk insert
+        combined = ExtractedData()
+        for extracted_data in extractions:
+            if isinstance(extracted_data, ExtractedData):
+                for company in extracted_data.companies:
+                    combined.add_company(company)
+        
+        results = self.db_manager.insert_extracted_data_bulk(combined) if combined.total_companies else None
+        self.response_cache.clear()
+        stored = not results or results['failed_inserts'] == 0
+        
+        messages = []
+        for extracted_data in extractions:
+            if isinstance(extracted_data, Exception):
+                messages.append(f"Error processing text: {str(extracted_data)}")
+            elif extracted_data.total_companies == 0:
+                messages.append("No company information found in the provided text.")
+            else:
+                total = extracted_data.total_companies
+                successful, failed = (total, 0) if stored else (0, total)
+                messages.append(f"Successfully processed text and found {total} companies. Stored {successful} companies in database. Failed: {failed}")
+        return messages
\ No newline at end of file
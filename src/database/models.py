@@ -1,16 +1,20 @@
 """
 SQLAlchemy models for database tables.
 """
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
-from sqlalchemy import Column, Integer, String, DateTime, Text, create_engine
+from typing import List, Optional
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Index, DDL, create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
-import json
 
 Base = declarative_base()
 
+# Trigram matching backs substring (ILIKE '%term%') and fuzzy name search
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 
 class CompanyDetails(Base):
     """Database model for company details."""
@@ -19,38 +23,77 @@ class CompanyDetails(Base):
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String(255), nullable=False, index=True)
     founded_in = Column(DateTime, nullable=True, index=True)
-    founded_by = Column(Text, nullable=True)  # JSON string of founder names
+    founded_by = Column(ARRAY(String), nullable=True)  # Founder names
+    # Kept in sync by PostgreSQL on every write, so statistics never count arrays on read
+    founder_count = Column(Integer, Computed("coalesce(cardinality(founded_by), 0)", persisted=True), nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # GIN index so founder containment queries (@>) avoid a sequential scan
+        Index("ix_founded_by_gin", "founded_by", postgresql_using="gin"),
+        # One row per company regardless of case; serves lower(name) lookups and upserts
+        Index("ux_company_name_lower", func.lower(company_name), unique=True),
+        # Trigram GIN index serving ILIKE '%term%' and similarity (%) searches on names
+        Index(
+            "ix_company_name_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"}
+        ),
+    )
+    
     def get_founders(self) -> List[str]:
         """Get founders as a list of strings."""
-        if hasattr(self, 'founded_by') and self.founded_by is not None:
-            try:
-                return json.loads(str(self.founded_by))
-            except (json.JSONDecodeError, TypeError):
-                return []
-        return []
+        return list(self.founded_by) if self.founded_by else []
     
     def set_founders(self, founders: List[str]):
         """Set founders from a list of strings."""
-        self.founded_by = json.dumps(founders) if founders else None
+        self.founded_by = list(founders) if founders else None
     
     def __repr__(self):
         return f"<CompanyDetails(id={self.id}, name='{self.company_name}', founded_in={self.founded_in}, founded_by={self.get_founders()})>"
 
 
+@dataclass(slots=True)
+class CompanyRow:
+    """Lightweight read-only view of a company_details row."""
+    id: int
+    company_name: str
+    founded_in: Optional[datetime]
+    founded_by: List[str] = field(default_factory=list)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_row(cls, row) -> "CompanyRow":
+        """Build from a (id, company_name, founded_in, founded_by, created_at, updated_at) tuple."""
+        company_id, company_name, founded_in, founded_by, created_at, updated_at = row
+        return cls(company_id, company_name, founded_in, founded_by or [], created_at, updated_at)
+
+
 class DatabaseManager:
     """Manager class for database operations."""
     
-    def __init__(self, connection_string: str):
-        self.engine = create_engine(connection_string)
+    def __init__(self, connection_string: str, pool_size: int = 10, max_overflow: int = 20):
+        # One pooled engine per manager; share the manager instead of creating more
+        self.engine = create_engine(
+            connection_string,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=1800
+        )
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def create_tables(self):
         """Create all database tables."""
         Base.metadata.create_all(bind=self.engine)
     
+    def raw_connection(self):
+        """Get a pooled DBAPI connection for driver-level operations such as COPY."""
+        return self.engine.raw_connection()
+    
     def get_session(self):
         """Get a database session."""
         return self.SessionLocal()
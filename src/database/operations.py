@@ -1,58 +1,141 @@
 """
 Database operations for company data storage and retrieval.
 """
-from typing import List, Optional, Dict, Any
+import csv
+import io
+from typing import Iterator, List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import String, and_, bindparam, or_, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
-from .models import DatabaseManager, CompanyDetails
+from .models import DatabaseManager, CompanyDetails, CompanyRow
 from models.company import CompanyData, ExtractedData
+from utils.cache import TTLCache
+
+# Rows fetched per round trip when streaming results from a server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+# Batches of at least this many companies are loaded with COPY instead of parameterized inserts
+COPY_THRESHOLD = 500
+
+# Columns selected for CompanyRow results (plain tuples, no ORM instance hydration)
+COMPANY_ROW_COLUMNS = (
+    CompanyDetails.id,
+    CompanyDetails.company_name,
+    CompanyDetails.founded_in,
+    CompanyDetails.founded_by,
+    CompanyDetails.created_at,
+    CompanyDetails.updated_at
+)
+
+
+def _upsert_statement():
+    """Build an INSERT ... ON CONFLICT (lower(company_name)) DO UPDATE returning each row's id."""
+    stmt = insert(CompanyDetails)
+    return stmt.on_conflict_do_update(
+        index_elements=[func.lower(CompanyDetails.company_name)],
+        set_={
+            "founded_in": stmt.excluded.founded_in,
+            "founded_by": stmt.excluded.founded_by,
+            "updated_at": func.now()
+        }
+    ).returning(CompanyDetails.id, CompanyDetails.company_name)
+
+
+# Statements are built once at import and executed with bound parameters
+UPSERT_STMT = _upsert_statement()
+
+BY_ID_STMT = select(*COMPANY_ROW_COLUMNS).where(CompanyDetails.id == bindparam("company_id"))
+
+BY_NAME_STMT = select(*COMPANY_ROW_COLUMNS).where(
+    func.lower(CompanyDetails.company_name) == bindparam("company_name")
+)
+
+BY_FOUNDER_STMT = select(*COMPANY_ROW_COLUMNS).where(
+    # Array containment (@>) matches whole founder names and can use the GIN index
+    CompanyDetails.founded_by.contains(bindparam("founders", type_=ARRAY(String)))
+)
+
+SEARCH_STMT = select(*COMPANY_ROW_COLUMNS).where(or_(
+    CompanyDetails.company_name.ilike(bindparam("pattern")),
+    func.array_to_string(CompanyDetails.founded_by, ' ').ilike(bindparam("pattern"))
+))
+
+FUZZY_SEARCH_STMT = select(*COMPANY_ROW_COLUMNS).where(or_(
+    CompanyDetails.company_name.op('%')(bindparam("term")),
+    func.array_to_string(CompanyDetails.founded_by, ' ').ilike(bindparam("pattern"))
+)).order_by(func.similarity(CompanyDetails.company_name, bindparam("term")).desc())
+
+# LIMIT NULL means no limit in PostgreSQL, so one statement serves both cases
+ALL_COMPANIES_STMT = select(*COMPANY_ROW_COLUMNS).order_by(CompanyDetails.id).offset(
+    bindparam("offset")
+).limit(bindparam("limit"))
+
+# COPY path: stream rows into a transaction-scoped staging table, then upsert them in one statement
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE company_details_staging (
+    company_name varchar(255),
+    founded_in timestamp,
+    founded_by varchar[]
+) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = """
+COPY company_details_staging (company_name, founded_in, founded_by)
+FROM STDIN WITH (FORMAT csv, FORCE_NULL (founded_in, founded_by))
+"""
+
+UPSERT_FROM_STAGING_SQL = """
+INSERT INTO company_details (company_name, founded_in, founded_by, created_at, updated_at)
+SELECT company_name, founded_in, founded_by, now(), now() FROM company_details_staging
+ON CONFLICT (lower(company_name)) DO UPDATE
+SET founded_in = EXCLUDED.founded_in, founded_by = EXCLUDED.founded_by, updated_at = now()
+RETURNING id, company_name
+"""
+
+STATS_STMT = select(
+    func.count(CompanyDetails.id),
+    func.count(CompanyDetails.founded_in),
+    func.coalesce(func.sum(CompanyDetails.founder_count), 0)
+)
 
 
 class CompanyDatabaseOperations:
     """Handles all database operations for company data."""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, cache_ttl: float = 30.0):
         """Initialize with database manager."""
         self.db_manager = db_manager
+        # Short-lived cache for statistics/listings, cleared on every write
+        self.read_cache = TTLCache(ttl=cache_ttl)
     
     def insert_company_data(self, company_data: CompanyData) -> Optional[int]:
-        """Insert a single company data into the database."""
+        """Insert a single company data into the database, updating it if the name already exists."""
         session = self.db_manager.get_session()
         try:
-            # Check if company already exists
-            existing_company = session.query(CompanyDetails).filter(
-                CompanyDetails.company_name.ilike(company_data.company_name)
-            ).first()
+            # Atomic upsert in one round trip
+            company_id, _ = session.execute(UPSERT_STMT, {
+                "company_name": company_data.company_name,
+                "founded_in": company_data.founding_date,
+                "founded_by": list(company_data.founders) or None
+            }).one()
+            session.commit()
+            return company_id
             
-            if existing_company:
-                # Update existing company
-                existing_company.founded_in = company_data.founding_date
-                existing_company.set_founders(company_data.founders)
-                
-                session.commit()
-                return existing_company.id
-            else:
-                # Create new company
-                company = CompanyDetails(
-                    company_name=company_data.company_name,
-                    founded_in=company_data.founding_date
-                )
-                company.set_founders(company_data.founders)
-                
-                session.add(company)
-                session.commit()
-                return company.id
-                
         except Exception as e:
             session.rollback()
             print(f"Error inserting company data: {e}")
             return None
         finally:
             self.db_manager.close_session(session)
+            self.read_cache.clear()
     
     def insert_extracted_data(self, extracted_data: ExtractedData) -> Dict[str, Any]:
         """Insert multiple company data entries."""
+        return self.insert_extracted_data_bulk(extracted_data)
+    
+    def insert_extracted_data_bulk(self, extracted_data: ExtractedData) -> Dict[str, Any]:
+        """Insert or update multiple company data entries in a single session and commit."""
         results = {
             "total_companies": extracted_data.total_companies,
             "successful_inserts": 0,
@@ -60,119 +143,176 @@ class CompanyDatabaseOperations:
             "inserted_ids": []
         }
         
-        for company in extracted_data.companies:
-            company_id = self.insert_company_data(company)
-            if company_id:
-                results["successful_inserts"] += 1
-                results["inserted_ids"].append(company_id)
+        # Later mentions of the same company (case-insensitive) win, as with sequential inserts,
+        # while a newly inserted row keeps the first spelling seen
+        latest_by_name = {}
+        first_names = {}
+        for company_data in extracted_data.companies:
+            key = company_data.company_name.lower()
+            latest_by_name[key] = company_data
+            first_names.setdefault(key, company_data.company_name)
+        
+        if not latest_by_name:
+            return results
+        
+        # Each name appears once, since ON CONFLICT cannot touch the same row twice within a statement
+        records = [
+            {
+                "company_name": first_names[key],
+                "founded_in": company_data.founding_date,
+                "founded_by": list(company_data.founders) or None
+            }
+            for key, company_data in latest_by_name.items()
+        ]
+        
+        try:
+            if len(records) >= COPY_THRESHOLD:
+                rows = self._copy_upsert(records)
             else:
-                results["failed_inserts"] += 1
+                rows = self._upsert(records)
+            
+            ids_by_name = {company_name.lower(): company_id for company_id, company_name in rows}
+            results["inserted_ids"] = [
+                ids_by_name[company_data.company_name.lower()]
+                for company_data in extracted_data.companies
+            ]
+            results["successful_inserts"] = len(results["inserted_ids"])
+        except Exception as e:
+            print(f"Error bulk inserting company data: {e}")
+            results["failed_inserts"] = extracted_data.total_companies
+        finally:
+            self.read_cache.clear()
         
         return results
     
-    def get_company_by_id(self, company_id: int) -> Optional[Dict[str, Any]]:
+    def _upsert(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Upsert records with one parameterized statement, returning (id, company_name) rows."""
+        session = self.db_manager.get_session()
+        try:
+            rows = session.execute(UPSERT_STMT, records).all()
+            session.commit()
+            return rows
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.db_manager.close_session(session)
+    
+    def _copy_upsert(self, records: List[Dict[str, Any]]) -> List[Any]:
+        """Upsert records through COPY into a staging table, returning (id, company_name) rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        for record in records:
+            founded_in = record["founded_in"]
+            writer.writerow((
+                record["company_name"],
+                founded_in.isoformat() if founded_in else None,
+                self._array_literal(record["founded_by"]) if record["founded_by"] else None
+            ))
+        buffer.seek(0)
+        
+        connection = self.db_manager.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL)
+                cursor.copy_expert(COPY_STAGING_SQL, buffer)
+                cursor.execute(UPSERT_FROM_STAGING_SQL)
+                rows = cursor.fetchall()
+            connection.commit()
+            return rows
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+    
+    @staticmethod
+    def _array_literal(values: List[str]) -> str:
+        """Format strings as a PostgreSQL array literal for COPY."""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for value in values)
+        return "{" + ",".join(f'"{value}"' for value in escaped) + "}"
+    
+    def get_company_by_id(self, company_id: int) -> Optional[CompanyRow]:
         """Retrieve company by ID."""
         session = self.db_manager.get_session()
         try:
-            company = session.query(CompanyDetails).filter(CompanyDetails.id == company_id).first()
-            if company:
-                return {
-                    "id": company.id,
-                    "company_name": company.company_name,
-                    "founded_in": company.founded_in,
-                    "founded_by": company.get_founders(),
-                    "created_at": company.created_at,
-                    "updated_at": company.updated_at
-                }
-            return None
+            row = session.execute(BY_ID_STMT, {"company_id": company_id}).first()
+            return CompanyRow.from_row(row) if row else None
         finally:
             self.db_manager.close_session(session)
     
-    def get_company_by_name(self, company_name: str) -> Optional[Dict[str, Any]]:
+    def get_company_by_name(self, company_name: str) -> Optional[CompanyRow]:
         """Retrieve company by name (case-insensitive)."""
         session = self.db_manager.get_session()
         try:
-            company = session.query(CompanyDetails).filter(
-                CompanyDetails.company_name.ilike(company_name)
-            ).first()
-            if company:
-                return {
-                    "id": company.id,
-                    "company_name": company.company_name,
-                    "founded_in": company.founded_in,
-                    "founded_by": company.get_founders(),
-                    "created_at": company.created_at,
-                    "updated_at": company.updated_at
-                }
-            return None
+            row = session.execute(BY_NAME_STMT, {"company_name": company_name.lower()}).first()
+            return CompanyRow.from_row(row) if row else None
         finally:
             self.db_manager.close_session(session)
     
-    def search_companies(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search companies by name or founder."""
+    def search_companies(self, search_term: str, fuzzy: bool = False) -> Iterator[CompanyRow]:
+        """Search companies by name or founder, streaming matches from a server-side cursor.
+        
+        With fuzzy=True, names are matched by trigram similarity (tolerating typos)
+        and results are ordered by closeness to the search term. The generator keeps a pooled
+        connection checked out until it is exhausted or closed, so callers that stop early must
+        call close() (or wrap it in contextlib.closing).
+        """
         session = self.db_manager.get_session()
         try:
-            # Search by company name
-            companies_by_name = session.query(CompanyDetails).filter(
-                CompanyDetails.company_name.ilike(f"%{search_term}%")
-            ).all()
-            
-            # Search by founder (using JSON search)
-            companies_by_founder = session.query(CompanyDetails).filter(
-                CompanyDetails.founded_by.ilike(f"%{search_term}%")
-            ).all()
-            
-            # Combine and deduplicate results
-            all_companies = list(set(companies_by_name + companies_by_founder))
-            
-            return [{
-                "id": company.id,
-                "company_name": company.company_name,
-                "founded_in": company.founded_in,
-                "founded_by": company.get_founders(),
-                "created_at": company.created_at,
-                "updated_at": company.updated_at
-            } for company in all_companies]
+            # Match by company name or founder in one query; rows are unique by primary key
+            stmt = FUZZY_SEARCH_STMT if fuzzy else SEARCH_STMT
+            result = session.execute(
+                stmt.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE),
+                {"term": search_term, "pattern": f"%{search_term}%"}
+            )
+            for row in result:
+                yield CompanyRow.from_row(row)
         finally:
             self.db_manager.close_session(session)
     
-    def get_all_companies(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all companies with optional pagination."""
+    def get_all_companies(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[CompanyRow]:
+        """Iterate over all companies with optional pagination.
+        
+        Rows are streamed from a server-side cursor, so listing without a limit
+        uses constant memory. Limited listings are also cached briefly. As with
+        search_companies, callers that stop early must close() the generator to
+        return its connection to the pool.
+        """
+        cache_key = ("all_companies", limit, offset)
+        if limit:
+            hit, cached = self.read_cache.get(cache_key)
+            if hit:
+                yield from cached
+                return
+        
+        generation = self.read_cache.generation
         session = self.db_manager.get_session()
         try:
-            query = session.query(CompanyDetails).offset(offset)
-            if limit:
-                query = query.limit(limit)
-            
-            companies = query.all()
+            result = session.execute(
+                ALL_COMPANIES_STMT.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE),
+                {"offset": offset, "limit": limit or None}
+            )
+            companies = []
+            for row in result:
+                company = CompanyRow.from_row(row)
+                if limit:
+                    companies.append(company)
+                yield company
             
-            return [{
-                "id": company.id,
-                "company_name": company.company_name,
-                "founded_in": company.founded_in,
-                "founded_by": company.get_founders(),
-                "created_at": company.created_at,
-                "updated_at": company.updated_at
-            } for company in companies]
+            # Skip caching if a write cleared the cache while the rows were being read
+            if limit and self.read_cache.generation == generation:
+                self.read_cache.set(cache_key, companies)
         finally:
             self.db_manager.close_session(session)
     
-    def get_companies_by_founder(self, founder_name: str) -> List[Dict[str, Any]]:
+    def get_companies_by_founder(self, founder_name: str) -> List[CompanyRow]:
         """Get all companies founded by a specific person."""
         session = self.db_manager.get_session()
         try:
-            companies = session.query(CompanyDetails).filter(
-                CompanyDetails.founded_by.ilike(f"%{founder_name}%")
-            ).all()
+            rows = session.execute(BY_FOUNDER_STMT, {"founders": [founder_name]}).all()
             
-            return [{
-                "id": company.id,
-                "company_name": company.company_name,
-                "founded_in": company.founded_in,
-                "founded_by": company.get_founders(),
-                "created_at": company.created_at,
-                "updated_at": company.updated_at
-            } for company in companies]
+            return [CompanyRow.from_row(row) for row in rows]
         finally:
             self.db_manager.close_session(session)
     
@@ -192,29 +332,28 @@ class CompanyDatabaseOperations:
             return False
         finally:
             self.db_manager.close_session(session)
+            self.read_cache.clear()
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics."""
+        hit, cached = self.read_cache.get("statistics")
+        if hit:
+            return dict(cached)
+        
+        generation = self.read_cache.generation
         session = self.db_manager.get_session()
         try:
-            total_companies = session.query(CompanyDetails).count()
-            
-            # Get companies with founding dates
-            companies_with_dates = session.query(CompanyDetails).filter(
-                CompanyDetails.founded_in.isnot(None)
-            ).count()
-            
-            # Count total founders (approximate from JSON)
-            total_founders = 0
-            companies = session.query(CompanyDetails).all()
-            for company in companies:
-                total_founders += len(company.get_founders())
+            # Compute every metric in one aggregate query instead of loading rows
+            total_companies, companies_with_dates, total_founders = session.execute(STATS_STMT).one()
             
-            return {
+            stats = {
                 "total_companies": total_companies,
                 "total_founders": total_founders,
                 "companies_with_founding_dates": companies_with_dates,
                 "companies_without_founding_dates": total_companies - companies_with_dates
             }
+            if self.read_cache.generation == generation:
+                self.read_cache.set("statistics", stats)
+            return dict(stats)
         finally:
             self.db_manager.close_session(session) 
\ No newline at end of file
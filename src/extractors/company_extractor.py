@@ -1,72 +1,177 @@
 """
 LCEL-based company information extractor using LangChain.
 """
+import asyncio
+import bisect
+import hashlib
+import io
+import itertools
 import json
 import re
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from langchain_core.runnables import RunnablePassthrough, RunnableLambda
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, AsyncIterator, Iterator, Tuple
+import orjson
+from pydantic import BaseModel
+from langchain_core.runnables import Runnable, RunnablePassthrough
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_openai import ChatOpenAI
+from langchain_core.utils.json import parse_json_markdown
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from models.company import CompanyData, ExtractedData
+from models.company import CompanyData, ExtractedData, ExtractionResult, PackedExtractionResult
+from utils.cache import LRUCache
+from utils.event_loop import run_sync
+
+if TYPE_CHECKING:
+    # langchain_openai (and the openai SDK) is slow to import, so it is loaded on first use
+    from langchain_openai import ChatOpenAI
+
+# JSON schema for streamed and Batch API completions (mirrors ExtractionResult), bound as a raw
+# response_format because those paths parse the JSON themselves
+EXTRACTION_JSON_SCHEMA = {
+    "name": "extracted_data",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "companies": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "company_name": {"type": "string"},
+                        "founding_date": {"type": ["string", "null"]},
+                        "founders": {"type": "array", "items": {"type": "string"}}
+                    },
+                    "required": ["company_name", "founding_date", "founders"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["companies"],
+        "additionalProperties": False
+    }
+}
+
+# Text cleaning and paragraph splitting patterns, compiled once at import
+WHITESPACE_RE = re.compile(r'\s+')
+DISALLOWED_CHARS_RE = re.compile(r'[^\w\s\.\,\-\:\;\(\)]')
+PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+# Markdown code fence the model sometimes wraps its JSON in
+JSON_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+# Points where long paragraphs may be split: after the whitespace following a sentence end or a line break
+SENTENCE_BREAK_RE = re.compile(r'[.!?]\s+|\n\s*')
+
+# Paragraphs whose lengths fall in the same LENGTH_BIN_SIZE-character bin are packed together
+LENGTH_BIN_SIZE = 256
+# Times paragraphs missing from a pack response are re-packed and sent again
+PACK_RETRIES = 1
+
+# Retries per OpenAI request on connection errors, timeouts, 429s and 5xx responses. The SDK backs
+# off exponentially with jitter and honours Retry-After; 400-class errors fail immediately
+MAX_RETRIES = 5
+
+# Chat models shared by every extractor with the same (API key, model name)
+_LLM_CACHE: Dict[Tuple[str, str], "ChatOpenAI"] = {}
+
+# Chat message types mapped to OpenAI API roles
+MESSAGE_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+# Extraction prompts, parsed once at import and shared by every extractor. The instructions sit
+# in a static system message ahead of the paragraph so providers can cache the common prefix.
+EXTRACTION_SYSTEM_PROMPT = """You are an expert at extracting company information from text.
+For each company mentioned in the user's text, extract:
+- company_name: the name of the company (required)
+- founding_date: the founding date as YYYY-MM-DD, or null if not found. Use the 1st of January
+  when only the year is given and the 1st of the month when only year and month are given.
+- founders: list of founder names as strings
+
+Respond with a JSON object of the form:
+{{"companies": [{{"company_name": "Example Corp", "founding_date": "2020-01-01", "founders": ["John Doe", "Jane Smith"]}}]}}
+Use an empty companies array if no company information is found."""
+
+EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EXTRACTION_SYSTEM_PROMPT),
+    ("human", "{text}")
+])
+
+# Packs several paragraphs into one request, answered with one entry per paragraph index
+PACKED_EXTRACTION_SYSTEM_PROMPT = """You are an expert at extracting company information from text.
+The user sends numbered paragraphs, one per line, each prefixed by its index.
+Analyze each paragraph independently. For each company mentioned, extract:
+- company_name: the name of the company (required)
+- founding_date: the founding date as YYYY-MM-DD, or null if not found. Use the 1st of January
+  when only the year is given and the 1st of the month when only year and month are given.
+- founders: list of founder names as strings
+
+Respond with a JSON object holding one entry per paragraph, in order, with the paragraph's index
+and its companies (an empty array if it mentions none), for example:
+{{"paragraphs": [{{"index": 0, "companies": [{{"company_name": "Example Corp", "founding_date": "2020-01-01", "founders": ["John Doe"]}}]}}, {{"index": 1, "companies": []}}]}}"""
+
+PACKED_EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", PACKED_EXTRACTION_SYSTEM_PROMPT),
+    ("human", "{paragraphs}")
+])
+
+
+def parse_json_output(text: str) -> Any:
+    """Parse a complete JSON model response, stripping any code fence."""
+    text = JSON_FENCE_RE.sub('', text)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # Fall back to LangChain's lenient parser for responses with surrounding prose
+        return parse_json_markdown(text)
 
 
 class CompanyExtractor:
     """LCEL-based extractor for company information from text."""
     
-    def __init__(self, openai_api_key: str, model_name: str = "gpt-3.5-turbo"):
-        """Initialize the extractor with OpenAI API key."""
-        self.llm = ChatOpenAI(
-            api_key=openai_api_key,
-            model=model_name,
-            temperature=0.1
-        )
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ". ", "! ", "? "]
-        )
+    def __init__(self, openai_api_key: str, model_name: str = "gpt-3.5-turbo", max_concurrency: int = 10,
+                 pack_size: int = 5, llm: Optional["ChatOpenAI"] = None):
+        """Initialize the extractor with OpenAI API key, or with an existing chat model."""
+        self.llm = llm or self._get_llm(openai_api_key, model_name)
+        # Paragraphs longer than 2000 characters are split into overlapping chunks
+        self.chunk_size = 1000
+        self.chunk_overlap = 200
         
-        # Define the extraction prompt
-        self.extraction_prompt = ChatPromptTemplate.from_template("""
-You are an expert at extracting company information from text. 
-Analyze the following paragraph and extract company details in JSON format.
-
-Text to analyze:
-{text}
-
-Extract the following information:
-- company_name: The name of the company (required)
-- founding_date: The founding date in ISO format (YYYY-MM-DD) if available, or null if not found
-- founders: List of founder names as strings
-
-If multiple companies are mentioned, extract information for each one.
-If only year is provided for founding date, use January 1st of that year.
-If year and month are provided, use the 1st day of that month.
-
-Return the result as a valid JSON array with objects containing these fields.
-If no company information is found, return an empty array.
-
-Example output format:
-[
-    {{
-        "company_name": "Example Corp",
-        "founding_date": "2020-01-01",
-        "founders": ["John Doe", "Jane Smith"]
-    }}
-]
-""")
-        
-        # Create the LCEL chain
+        self.extraction_prompt = EXTRACTION_PROMPT
+        
+        # Extractions of previously seen texts, keyed by content hash
+        self.text_cache = LRUCache(max_entries=1024)
+        # Companies per cleaned paragraph, so recurring boilerplate costs no tokens
+        self.paragraph_cache = LRUCache(max_entries=4096)
+        
+        # Caps in-flight LLM calls to stay within OpenAI rate limits; the semaphore is
+        # created inside the running event loop (see _get_semaphore)
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Create the LCEL chain; strict structured output constrains the model to ExtractionResult.
+        # Response formats are bound per chain so the shared chat model stays free-form.
         self.extraction_chain = (
             {"text": RunnablePassthrough()}
             | self.extraction_prompt
-            | self.llm
+            | self._structured_llm(ExtractionResult)
+        )
+        # Streaming needs JsonOutputParser, which re-parses the partial output on every chunk
+        self.streaming_extraction_chain = (
+            {"text": RunnablePassthrough()}
+            | self.extraction_prompt
+            | self.llm.bind(response_format=self._response_format())
             | JsonOutputParser()
         )
+        
+        # Paragraphs per request for packed extraction, dividing request count (RPM) by pack_size
+        self.pack_size = pack_size
+        self.packed_extraction_chain = (
+            {"paragraphs": RunnablePassthrough()}
+            | PACKED_EXTRACTION_PROMPT
+            | self._structured_llm(PackedExtractionResult)
+        )
     
     def extract_from_paragraph(self, paragraph: str) -> List[CompanyData]:
         """Extract company information from a single paragraph."""
@@ -76,79 +181,395 @@ Example output format:
             if not cleaned_paragraph.strip():
                 return []
             
+            cached = self._cached_paragraph(cleaned_paragraph)
+            if cached is not None:
+                return cached
+            
             # Extract using LCEL chain
             result = self.extraction_chain.invoke(cleaned_paragraph)
             
-            # Convert to CompanyData objects
-            companies = []
-            for company_info in result:
-                try:
-                    company_data = CompanyData(
-                        company_name=company_info.get("company_name", ""),
-                        founding_date=company_info.get("founding_date"),
-                        founders=company_info.get("founders", [])
-                    )
-                    companies.append(company_data)
-                except Exception as e:
-                    print(f"Error processing company data: {e}")
-                    continue
+            companies = self._to_company_data(self._company_list(result))
+            self._cache_paragraph(cleaned_paragraph, companies)
+            return companies
             
+        except Exception as e:
+            print(f"Error extracting from paragraph: {e}")
+            return []
+    
+    async def aextract_from_paragraph(self, paragraph: str) -> List[CompanyData]:
+        """Asynchronously extract company information from a single paragraph."""
+        try:
+            cleaned_paragraph = self._clean_text(paragraph)
+            if not cleaned_paragraph.strip():
+                return []
+            
+            cached = self._cached_paragraph(cleaned_paragraph)
+            if cached is not None:
+                return cached
+            
+            async with self._get_semaphore():
+                result = await self.extraction_chain.ainvoke(cleaned_paragraph)
+            
+            companies = self._to_company_data(self._company_list(result))
+            self._cache_paragraph(cleaned_paragraph, companies)
             return companies
             
         except Exception as e:
             print(f"Error extracting from paragraph: {e}")
             return []
     
+    def extract_from_paragraphs_packed(self, paragraphs: List[str], pack_size: Optional[int] = None) -> List[List[CompanyData]]:
+        """Extract company information from paragraphs, several paragraphs per LLM request."""
+        return run_sync(self.aextract_from_paragraphs_packed(paragraphs, pack_size))
+    
+    async def aextract_from_paragraphs_packed(self, paragraphs: List[str],
+                                              pack_size: Optional[int] = None) -> List[List[CompanyData]]:
+        """Asynchronously extract company information from paragraphs, packing several into each request.
+        
+        Packs are sent concurrently; the result holds one list of companies per input paragraph.
+        """
+        pack_size = pack_size or self.pack_size
+        results: List[List[CompanyData]] = [[] for _ in paragraphs]
+        
+        # Remember each uncached paragraph's position so results map back to the input order
+        indexed = []
+        for index, paragraph in enumerate(paragraphs):
+            cleaned_paragraph = self._clean_text(paragraph)
+            if not cleaned_paragraph.strip():
+                continue
+            cached = self._cached_paragraph(cleaned_paragraph)
+            if cached is not None:
+                results[index] = cached
+            else:
+                indexed.append((index, cleaned_paragraph))
+        
+        # Paragraphs the model left out of its response are re-packed and sent again
+        for _ in range(PACK_RETRIES + 1):
+            if not indexed:
+                break
+            packs = self._pack_paragraphs(indexed, pack_size)
+            pack_results = await asyncio.gather(
+                *(self._aextract_pack([paragraph for _, paragraph in pack]) for pack in packs)
+            )
+            
+            indexed = []
+            for pack, companies_per_paragraph in zip(packs, pack_results):
+                # A failed pack leaves its paragraphs empty and uncached
+                if companies_per_paragraph is None:
+                    continue
+                for (index, paragraph), companies in zip(pack, companies_per_paragraph):
+                    if companies is None:
+                        indexed.append((index, paragraph))
+                        continue
+                    self._cache_paragraph(paragraph, companies)
+                    results[index] = companies
+        
+        # Paragraphs still missing after the retries stay empty and uncached
+        return results
+    
+    @staticmethod
+    def _pack_paragraphs(indexed: List[Tuple[int, str]], pack_size: int) -> List[List[Tuple[int, str]]]:
+        """Group (index, paragraph) pairs into packs of up to pack_size similar-length paragraphs."""
+        # Pack similar-length paragraphs together so one long paragraph doesn't hold up short ones
+        bins = defaultdict(list)
+        for index, paragraph in indexed:
+            bins[len(paragraph) // LENGTH_BIN_SIZE].append((index, paragraph))
+        return [
+            bin_items[start:start + pack_size]
+            for _, bin_items in sorted(bins.items())
+            for start in range(0, len(bin_items), pack_size)
+        ]
+    
+    async def _aextract_pack(self, paragraphs: List[str]) -> Optional[List[Optional[List[CompanyData]]]]:
+        """Extract a pack of cleaned paragraphs with one request, returning companies per paragraph.
+        
+        Returns None if the request fails, and None in place of any paragraph missing from the response.
+        """
+        try:
+            numbered = "\n".join(f"{index}: {paragraph}" for index, paragraph in enumerate(paragraphs))
+            async with self._get_semaphore():
+                result = await self.packed_extraction_chain.ainvoke(numbered)
+            
+            by_index = {
+                entry.index: self._to_company_data(self._company_list(entry))
+                for entry in result.paragraphs
+            }
+            return [by_index.get(index) for index in range(len(paragraphs))]
+        
+        except Exception as e:
+            print(f"Error extracting from paragraphs: {e}")
+            return None
+    
     def extract_from_text(self, text: str) -> ExtractedData:
-        """Extract company information from full text by processing paragraphs."""
-        # Split text into paragraphs
+        """Extract company information from full text by processing paragraphs concurrently."""
+        return run_sync(self.aextract_from_text(text))
+    
+    async def aextract_from_text(self, text: str) -> ExtractedData:
+        """Asynchronously extract company information from full text, all paragraph packs in flight at once."""
+        key = self._text_key(text)
+        hit, cached = self.text_cache.get(key)
+        if hit:
+            return cached.model_copy(deep=True)
+        
         paragraphs = self._split_into_paragraphs(text)
+        results = await self.aextract_from_paragraphs_packed(paragraphs)
         
+        # Results come back in paragraph order, so companies keep their document order
         extracted_data = ExtractedData()
-        
-        for paragraph in paragraphs:
-            companies = self.extract_from_paragraph(paragraph)
+        for companies in results:
             for company in companies:
                 extracted_data.add_company(company)
         
+        self._cache_extraction(key, extracted_data)
         return extracted_data
     
-    def extract_with_streaming(self, text: str):
-        """Extract company information with streaming support."""
-        paragraphs = self._split_into_paragraphs(text)
+    async def astream_companies(self, text: str) -> AsyncIterator[CompanyData]:
+        """Yield companies from text as soon as the LLM finishes generating each one."""
+        async for _, company in self._astream_paragraphs(text):
+            yield company
+    
+    async def _astream_paragraphs(self, text: str) -> AsyncIterator[Tuple[str, CompanyData]]:
+        """Stream the paragraphs of text concurrently, yielding (paragraph, company) pairs as companies complete.
         
-        for paragraph in paragraphs:
-            companies = self.extract_from_paragraph(paragraph)
-            yield {
-                "paragraph": paragraph,
-                "companies": companies,
-                "count": len(companies)
-            }
+        max_concurrency workers pull paragraphs from the lazy splitter, so only the paragraphs
+        being extracted are held in memory.
+        """
+        paragraphs = self._iter_paragraphs(text)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency)
+        
+        async def work():
+            try:
+                for paragraph in paragraphs:
+                    async for company in self._astream_paragraph(paragraph):
+                        await queue.put((paragraph, company))
+            except Exception as e:
+                print(f"Error streaming paragraphs: {e}")
+            # One None per worker marks it as finished; a cancelled worker skips this rather than
+            # blocking on a full queue that is no longer read
+            await queue.put(None)
+        
+        workers = [asyncio.create_task(work()) for _ in range(self.max_concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # Stop the remaining workers if the consumer stops early
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _astream_paragraph(self, paragraph: str) -> AsyncIterator[CompanyData]:
+        """Stream the extraction of a single paragraph, yielding each completed company."""
+        try:
+            cleaned_paragraph = self._clean_text(paragraph)
+            if not cleaned_paragraph.strip():
+                return
+            
+            cached = self._cached_paragraph(cleaned_paragraph)
+            if cached is not None:
+                for company in cached:
+                    yield company
+                return
+            
+            # The JSON parser emits the partially parsed object on every chunk; an element of
+            # its companies array is complete once the model has started generating the next one
+            emitted = 0
+            partial_companies = None
+            companies = []
+            async with self._get_semaphore():
+                async for partial in self.streaming_extraction_chain.astream(cleaned_paragraph):
+                    partial_companies = self._company_list(partial)
+                    while emitted < len(partial_companies) - 1:
+                        for company in self._to_company_data([partial_companies[emitted]]):
+                            companies.append(company)
+                            yield company
+                        emitted += 1
+            
+            if partial_companies is not None:
+                for company in self._to_company_data(partial_companies[emitted:]):
+                    companies.append(company)
+                    yield company
+                self._cache_paragraph(cleaned_paragraph, companies)
+        
+        except Exception as e:
+            print(f"Error extracting from paragraph: {e}")
+    
+    async def extract_with_streaming(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """Stream extraction events, yielding each company as soon as the LLM finishes generating it.
+        
+        Each event is a {"paragraph": ..., "company": CompanyData} dict. Paragraphs are streamed
+        concurrently, so events from different paragraphs may interleave.
+        """
+        async for paragraph, company in self._astream_paragraphs(text):
+            yield {"paragraph": paragraph, "company": company}
+    
+    @staticmethod
+    def _get_llm(openai_api_key: str, model_name: str) -> "ChatOpenAI":
+        """Return the shared chat model (and its HTTP connection pool) for an API key and model."""
+        key = (openai_api_key, model_name)
+        if key not in _LLM_CACHE:
+            from langchain_openai import ChatOpenAI
+            _LLM_CACHE[key] = ChatOpenAI(
+                api_key=openai_api_key,
+                model=model_name,
+                temperature=0.1,
+                max_retries=MAX_RETRIES
+            )
+        return _LLM_CACHE[key]
+    
+    @staticmethod
+    def _supports_structured_output(model_name: str) -> bool:
+        """Whether a model accepts json_schema response formats (the check langchain_openai applies)."""
+        return not (model_name.startswith("gpt-3") or model_name.startswith("gpt-4-") or model_name == "gpt-4")
+    
+    def _structured_llm(self, schema: type) -> Runnable:
+        """Bind the chat model to a strict output schema, using function calling on models without json_schema."""
+        method = "json_schema" if self._supports_structured_output(self.llm.model_name) else "function_calling"
+        return self.llm.with_structured_output(schema, method=method, strict=True)
+    
+    def _response_format(self) -> Dict[str, Any]:
+        """Return the raw response_format for single-paragraph completions parsed outside LangChain."""
+        if self._supports_structured_output(self.llm.model_name):
+            return {"type": "json_schema", "json_schema": EXTRACTION_JSON_SCHEMA}
+        # The system prompt already describes the {"companies": [...]} shape for JSON mode
+        return {"type": "json_object"}
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent LLM calls in the running event loop."""
+        # A semaphore is tied to one event loop; async callers may run their own loop besides run_sync()'s
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        """Hash text into a compact cache key."""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    def _cache_extraction(self, key: bytes, extracted_data: ExtractedData):
+        """Remember an extraction for repeated texts."""
+        # Paragraph errors are swallowed as empty results, so only cache extractions that found something
+        if extracted_data.total_companies:
+            self.text_cache.set(key, extracted_data.model_copy(deep=True))
+    
+    def _cached_paragraph(self, cleaned_paragraph: str) -> Optional[List[CompanyData]]:
+        """Return copies of the companies cached for a cleaned paragraph, or None on a miss."""
+        hit, cached = self.paragraph_cache.get((self.llm.model_name, self._text_key(cleaned_paragraph)))
+        if not hit:
+            return None
+        return [company.model_copy(deep=True) for company in cached]
+    
+    def _cache_paragraph(self, cleaned_paragraph: str, companies: List[CompanyData]):
+        """Remember the companies extracted from a cleaned paragraph for the current model."""
+        self.paragraph_cache.set(
+            (self.llm.model_name, self._text_key(cleaned_paragraph)),
+            tuple(company.model_copy(deep=True) for company in companies)
+        )
+    
+    @staticmethod
+    def _company_list(result: Any) -> List[Dict[str, Any]]:
+        """Return the companies array from a structured result or a {"companies": [...]} response."""
+        if isinstance(result, BaseModel):
+            return [company.model_dump() for company in result.companies]
+        if isinstance(result, dict):
+            return result.get("companies") or []
+        # Tolerate a bare array from models that ignore the requested shape
+        return result if isinstance(result, list) else []
+    
+    def _to_company_data(self, result: List[Dict[str, Any]]) -> List[CompanyData]:
+        """Convert raw chain output into CompanyData objects."""
+        companies = []
+        for company_info in result:
+            try:
+                companies.append(CompanyData.from_llm(company_info))
+            except Exception as e:
+                print(f"Error processing company data: {e}")
+                continue
+        return companies
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text for processing."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = WHITESPACE_RE.sub(' ', text.strip())
         # Remove special characters that might interfere with parsing
-        text = re.sub(r'[^\w\s\.\,\-\:\;\(\)]', '', text)
+        text = DISALLOWED_CHARS_RE.sub('', text)
         return text
     
     def _split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into meaningful paragraphs."""
+        return list(self._iter_paragraphs(text))
+    
+    def _iter_paragraphs(self, text: str) -> Iterator[str]:
+        """Yield the meaningful paragraphs of text one at a time, without splitting the whole text up front."""
+        start = 0
         # Split by double newlines first
-        paragraphs = re.split(r'\n\s*\n', text)
-        
-        # If paragraphs are too long, split them further
-        final_paragraphs = []
-        for paragraph in paragraphs:
-            if len(paragraph) > 2000:  # If paragraph is too long
-                chunks = self.text_splitter.split_text(paragraph)
-                final_paragraphs.extend(chunks)
-            else:
-                final_paragraphs.append(paragraph)
+        for match in itertools.chain(PARAGRAPH_BREAK_RE.finditer(text), [None]):
+            end = match.start() if match else len(text)
+            paragraph = text[start:end].strip()
+            start = match.end() if match else end
+            
+            # If paragraphs are too long, split them further
+            if len(paragraph) > 2000:
+                yield from self._fast_split(paragraph, self.chunk_size, self.chunk_overlap)
+            elif paragraph:
+                # Filter out empty paragraphs
+                yield paragraph
+    
+    @staticmethod
+    def _fast_split(text: str, max_chars: int = 1000, overlap: int = 200) -> List[str]:
+        """Split text into chunks of whole sentences or lines of at most max_chars, repeating up to overlap characters.
         
-        # Filter out empty paragraphs
-        return [p.strip() for p in final_paragraphs if p.strip()]
+        A sentence longer than max_chars is cut at the last space that fits (or at max_chars within a single word).
+        overlap is clamped to half of max_chars so every chunk advances through the text.
+        """
+        overlap = max(0, min(overlap, max_chars // 2))
+        breaks = [match.end() for match in SENTENCE_BREAK_RE.finditer(text)]
+        if not breaks or breaks[-1] != len(text):
+            breaks.append(len(text))
+        
+        chunks = []
+        start = 0
+        covered = 0
+        while start < len(text):
+            # End the chunk at the last sentence break that still fits, or cut at max_chars
+            index = bisect.bisect_right(breaks, start + max_chars) - 1
+            end = breaks[index] if index >= 0 else start
+            if end <= max(start, covered):
+                # No break fits past the previous chunk, so cut between words rather than through one
+                end = min(start + max_chars, len(text))
+                space = text.rfind(' ', max(start, covered) + 1, end)
+                if end < len(text) and space == -1 and start < covered:
+                    # Only one long word follows the overlap; drop the overlap rather than cut the word
+                    start = covered
+                    end = min(start + max_chars, len(text))
+                    space = text.rfind(' ', start + 1, end)
+                if end < len(text) and space != -1:
+                    end = space + 1
+            covered = end
+            
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= len(text):
+                break
+            
+            # Start the next chunk at the first sentence break inside the overlap window, or else at its
+            # first word, so text around the cut appears in both chunks
+            window_start = max(end - overlap, start + 1)
+            overlap_start = breaks[bisect.bisect_left(breaks, window_start)]
+            if overlap_start >= end:
+                space = text.find(' ', window_start - 1, end)
+                overlap_start = space + 1 if space != -1 else window_start
+            start = overlap_start if start < overlap_start < end else end
+        
+        return chunks
     
     def batch_extract(self, texts: List[str]) -> List[ExtractedData]:
         """Extract company information from multiple texts in batch."""
@@ -156,4 +577,90 @@ Example output format:
         for text in texts:
             result = self.extract_from_text(text)
             results.append(result)
-        return results 
\ No newline at end of file
+        return results 
+    
+    def batch_extract_offline(self, texts: List[str], poll_interval: float = 30.0) -> List[ExtractedData]:
+        """Extract company information from multiple texts using the OpenAI Batch API.
+        
+        Cheaper than online extraction but completes asynchronously (within 24h),
+        so this blocks while polling the batch until it finishes.
+        """
+        client = self.llm.root_client
+        response_format = self._response_format()
+        
+        # One chat completion request per paragraph, routed back by "<text index>:<paragraph index>"
+        requests = []
+        for text_index, text in enumerate(texts):
+            for paragraph_index, paragraph in enumerate(self._iter_paragraphs(text)):
+                cleaned_paragraph = self._clean_text(paragraph)
+                if not cleaned_paragraph.strip():
+                    continue
+                messages = self.extraction_prompt.format_messages(text=cleaned_paragraph)
+                requests.append({
+                    "custom_id": f"{text_index}:{paragraph_index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.llm.model_name,
+                        "messages": [
+                            {"role": MESSAGE_ROLES[message.type], "content": message.content}
+                            for message in messages
+                        ],
+                        "temperature": self.llm.temperature,
+                        "response_format": response_format
+                    }
+                })
+        
+        if not requests:
+            return [ExtractedData() for _ in texts]
+        
+        payload = "\n".join(json.dumps(request) for request in requests).encode("utf-8")
+        batch_file = client.files.create(file=("batch.jsonl", io.BytesIO(payload)), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        # Wait for the batch to reach a terminal state
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} finished with status '{batch.status}'")
+        
+        # Successful requests land in the output file and failed ones in the error file
+        output_lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                output_lines.extend(client.files.content(file_id).text.splitlines())
+        
+        # Collect each paragraph's companies, then fold them into their text in paragraph order
+        paragraph_companies = {}
+        for line in output_lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    error = record.get("error") or (response.get("body") or {}).get("error")
+                    print(f"Error in batch request {record.get('custom_id')}: {error}")
+                    continue
+                
+                content = response["body"]["choices"][0]["message"]["content"]
+                text_index, paragraph_index = map(int, record["custom_id"].split(":"))
+                paragraph_companies[(text_index, paragraph_index)] = self._to_company_data(
+                    self._company_list(parse_json_output(content))
+                )
+            except Exception as e:
+                print(f"Error processing batch output: {e}")
+                continue
+        
+        results = [ExtractedData() for _ in texts]
+        for (text_index, _), companies in sorted(paragraph_companies.items()):
+            for company in companies:
+                results[text_index].add_company(company)
+        
+        return results
@@ -1,56 +1,161 @@
 """
 Data models for company information extraction.
 """
+import re
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
-from dateutil import parser
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, field_validator
+
+# Year-only ("1976") and year-month ("1976-04") founding dates, resolved to the first day
+YEAR_MONTH_RE = re.compile(r'^(\d{4})(?:-(\d{1,2}))?$')
+
+
+def parse_founding_date(v: Any) -> Optional[datetime]:
+    """Parse a founding date from the LLM, returning None if it can't be parsed."""
+    if v is None:
+        return None
+    
+    if isinstance(v, datetime):
+        return v
+    
+    if isinstance(v, str):
+        v = v.strip()
+        
+        # The prompt asks for ISO dates, so try the fast C parser first
+        try:
+            return datetime.fromisoformat(v)
+        except ValueError:
+            pass
+        
+        match = YEAR_MONTH_RE.match(v)
+        if match:
+            try:
+                return datetime(int(match.group(1)), int(match.group(2) or 1), 1)
+            except ValueError:
+                return None
+        
+        try:
+            # Fall back to fuzzy parsing for free-form dates; dateutil is slow to import, so load it lazily
+            from dateutil import parser
+            # Missing month/day default to the 1st, as for year-only dates
+            first_of_year = datetime(datetime.now().year, 1, 1)
+            parsed_date = parser.parse(v, fuzzy=True, default=first_of_year)
+            return parsed_date
+        except (ValueError, TypeError, OverflowError):
+            # If parsing fails, return None
+            return None
+    
+    return None
 
 
 class CompanyData(BaseModel):
     """Model for extracted company information."""
+    # Ignore any extra keys the LLM adds rather than storing them on the model
+    model_config = ConfigDict(extra="ignore")
+    
     company_name: str = Field(..., description="Name of the company")
     founding_date: Optional[datetime] = Field(None, description="Founding date of the company")
     founders: List[str] = Field(default_factory=list, description="List of company founders")
     
-    @validator('founding_date', pre=True)
+    @field_validator('founding_date', mode='before')
+    @classmethod
     def parse_founding_date(cls, v):
         """Parse and validate founding date with fallback logic."""
-        if v is None:
-            return None
-        
-        if isinstance(v, datetime):
-            return v
-        
-        if isinstance(v, str):
-            try:
-                # Try to parse the date string
-                parsed_date = parser.parse(v, fuzzy=True)
-                return parsed_date
-            except (ValueError, TypeError):
-                # If parsing fails, return None
-                return None
-        
-        return None
+        # from_llm passes datetimes already, so LLM output takes the isinstance fast path
+        return parse_founding_date(v)
+    
+    @classmethod
+    def from_llm(cls, data: Dict[str, Any]) -> "CompanyData":
+        """Build from one company object in the LLM's JSON output, parsing its date once here."""
+        return cls(
+            company_name=data.get("company_name", ""),
+            founding_date=parse_founding_date(data.get("founding_date")),
+            founders=data.get("founders") or []
+        )
 
 
 class ExtractedData(BaseModel):
-    """Container for multiple company data extractions."""
+    """Container for multiple company data extractions.
+    
+    Add companies with add_company(); changing the companies list directly leaves the name and
+    founder lookups stale.
+    """
     companies: List[CompanyData] = Field(default_factory=list, description="List of extracted company data")
-    total_companies: int = Field(0, description="Total number of companies extracted")
+    
+    # Lowercased name/founder -> companies, maintained by add_company (not serialized)
+    _name_index: Dict[str, List[CompanyData]] = PrivateAttr(default_factory=dict)
+    _founder_index: Dict[str, List[CompanyData]] = PrivateAttr(default_factory=dict)
+    
+    def model_post_init(self, __context: Any):
+        """Index companies passed to the constructor."""
+        self._rebuild_indexes()
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "ExtractedData":
+        """Copy the data, re-indexing the copy's companies."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied._rebuild_indexes()
+        return copied
+    
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "ExtractedData":
+        """Deep-copy the data; the copied indexes would otherwise point at the original's companies."""
+        copied = super().__deepcopy__(memo)
+        copied._rebuild_indexes()
+        return copied
+    
+    @computed_field(description="Total number of companies extracted")
+    @property
+    def total_companies(self) -> int:
+        """Number of extracted companies, derived from the companies list."""
+        return len(self.companies)
     
     def add_company(self, company: CompanyData):
         """Add a company to the extracted data."""
         self.companies.append(company)
-        self.total_companies = len(self.companies)
+        self._index_company(company)
     
     def get_companies_by_name(self, name: str) -> List[CompanyData]:
         """Get companies by name (case-insensitive)."""
-        return [c for c in self.companies if c.company_name.lower() == name.lower()]
+        return list(self._name_index.get(name.lower(), []))
     
     def get_companies_by_founder(self, founder: str) -> List[CompanyData]:
         """Get companies by founder name (case-insensitive)."""
-        return [c for c in self.companies if any(f.lower() in founder.lower() for f in c.founders)]
+        return list(self._founder_index.get(founder.lower(), []))
+    
+    def _rebuild_indexes(self):
+        """Rebuild the name and founder lookups from the companies list."""
+        self._name_index = {}
+        self._founder_index = {}
+        for company in self.companies:
+            self._index_company(company)
+    
+    def _index_company(self, company: CompanyData):
+        """Add a company to the name and founder lookups."""
+        self._name_index.setdefault(company.company_name.lower(), []).append(company)
+        for founder in dict.fromkeys(f.lower() for f in company.founders):
+            self._founder_index.setdefault(founder, []).append(company)
+
+
+class ExtractedCompany(BaseModel):
+    """A company mentioned in the text, as emitted by the LLM."""
+    company_name: str = Field(..., description="Name of the company")
+    founding_date: Optional[str] = Field(..., description="Founding date as YYYY-MM-DD, or null if not found")
+    founders: List[str] = Field(..., description="List of company founders")
+
+
+class ExtractionResult(BaseModel):
+    """Companies extracted from a paragraph (the LLM's structured output)."""
+    companies: List[ExtractedCompany] = Field(..., description="Companies mentioned in the paragraph")
+
+
+class PackedParagraphResult(BaseModel):
+    """Companies extracted from one paragraph of a pack, identified by its index."""
+    index: int = Field(..., description="Index of the paragraph in the request")
+    companies: List[ExtractedCompany] = Field(..., description="Companies mentioned in the paragraph")
+
+
+class PackedExtractionResult(BaseModel):
+    """Companies extracted from a pack of numbered paragraphs (the LLM's structured output)."""
+    paragraphs: List[PackedParagraphResult] = Field(..., description="One entry per paragraph in the request")
 
 
 class DatabaseConfig(BaseModel):
@@ -0,0 +1,145 @@
+"""
+In-process caches for agent responses, extractions and database reads.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """Small cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, ttl: float = 30.0):
+        """Initialize the cache with a time-to-live in seconds."""
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # Bumped by clear(), so a reader can tell whether the data it loaded was invalidated meanwhile
+        self.generation = 0
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if it has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return False, None
+        return True, value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value for a key."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def clear(self):
+        """Drop every cached entry."""
+        self._entries.clear()
+        self.generation += 1
+
+
+class LRUCache:
+    """Bounded cache that evicts the least recently used entry when full."""
+    
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache with a maximum number of entries."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, marking it as recently used."""
+        if key not in self._entries:
+            return False, None
+        self._entries.move_to_end(key)
+        return True, self._entries[key]
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value for a key, evicting the oldest entry if the cache is full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached entry."""
+        self._entries.clear()
+
+
+class SemanticResponseCache:
+    """Two-tier cache for agent responses: exact match first, then embedding similarity."""
+    
+    def __init__(self, embeddings=None, threshold: float = 0.95, max_entries: int = 256):
+        """Initialize the cache with an optional LangChain embeddings model for the semantic tier."""
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._exact: Dict[str, str] = {}
+        self._semantic: List[Tuple[List[float], str]] = []
+        self._last_embedding: Optional[Tuple[str, List[float]]] = None
+    
+    def lookup(self, query: str) -> Optional[str]:
+        """Return a cached response for the query or a near-duplicate of it."""
+        key = self._normalize(query)
+        if key in self._exact:
+            return self._exact[key]
+        
+        if self.embeddings is None or not self._semantic:
+            return None
+        
+        vector = self._embed(key)
+        if vector is None:
+            return None
+        
+        best_score, best_response = 0.0, None
+        for cached_vector, response in self._semantic:
+            score = self._cosine_similarity(vector, cached_vector)
+            if score > best_score:
+                best_score, best_response = score, response
+        
+        return best_response if best_score >= self.threshold else None
+    
+    def update(self, query: str, response: str):
+        """Cache the response for a query."""
+        key = self._normalize(query)
+        if len(self._exact) >= self.max_entries:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del self._exact[next(iter(self._exact))]
+        self._exact[key] = response
+        
+        if self.embeddings is not None:
+            vector = self._embed(key)
+            if vector is not None:
+                self._semantic.append((vector, response))
+                del self._semantic[:-self.max_entries]
+    
+    def clear(self):
+        """Drop every cached response."""
+        self._exact.clear()
+        self._semantic.clear()
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text, skipping the semantic tier if the embeddings call fails."""
+        # A miss is usually followed by an update for the same query, so reuse its embedding
+        if self._last_embedding and self._last_embedding[0] == text:
+            return self._last_embedding[1]
+        try:
+            vector = self.embeddings.embed_query(text)
+            self._last_embedding = (text, vector)
+            return vector
+        except Exception as e:
+            print(f"Error embedding query for cache: {e}")
+            return None
+    
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """Normalize a query for exact-match lookups."""
+        return " ".join(query.lower().split())
+    
+    @staticmethod
+    def _cosine_similarity(a: List[float], b: List[float]) -> float:
+        """Compute cosine similarity between two vectors."""
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        if not norm:
+            return 0.0
+        return sum(x * y for x, y in zip(a, b)) / norm
@@ -2,6 +2,7 @@
 Configuration utilities for the company extraction system.
 """
 import os
+from functools import cached_property
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -9,16 +10,17 @@ from models.company import DatabaseConfig
 
 
 class Config:
-    """Configuration manager for the application."""
+    """Configuration manager for the application; each setting is read once (see reload())."""
     
     def __init__(self, env_file: Optional[str] = None):
         """Initialize configuration with optional environment file."""
+        self.env_file = env_file
         if env_file:
             load_dotenv(env_file)
         else:
             load_dotenv()
     
-    @property
+    @cached_property
     def openai_api_key(self) -> str:
         """Get OpenAI API key from environment."""
         api_key = os.getenv("OPENAI_API_KEY")
@@ -26,7 +28,7 @@ class Config:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         return api_key
     
-    @property
+    @cached_property
     def database_config(self) -> DatabaseConfig:
         """Get database configuration from environment."""
         return DatabaseConfig(
@@ -37,31 +39,47 @@ class Config:
             password=os.getenv("DB_PASSWORD", "")
         )
     
-    @property
+    @cached_property
     def model_name(self) -> str:
         """Get the model name to use for extraction."""
         return os.getenv("MODEL_NAME", "gpt-3.5-turbo")
     
-    @property
+    @cached_property
     def temperature(self) -> float:
         """Get the temperature setting for the model."""
         return float(os.getenv("TEMPERATURE", "0.1"))
     
-    @property
+    @cached_property
     def max_tokens(self) -> int:
         """Get the maximum tokens for model responses."""
         return int(os.getenv("MAX_TOKENS", "2000"))
     
-    @property
+    @cached_property
     def chunk_size(self) -> int:
         """Get the chunk size for text splitting."""
         return int(os.getenv("CHUNK_SIZE", "1000"))
     
-    @property
+    @cached_property
     def chunk_overlap(self) -> int:
         """Get the chunk overlap for text splitting."""
         return int(os.getenv("CHUNK_OVERLAP", "200"))
     
+    @cached_property
+    def max_concurrency(self) -> int:
+        """Get the maximum number of concurrent LLM calls."""
+        return int(os.getenv("MAX_CONCURRENCY", "10"))
+    
+    def reload(self):
+        """Re-read the environment file and drop every cached setting."""
+        if self.env_file:
+            load_dotenv(self.env_file, override=True)
+        else:
+            load_dotenv(override=True)
+        
+        for name, attribute in vars(type(self)).items():
+            if isinstance(attribute, cached_property):
+                self.__dict__.pop(name, None)
+    
     def validate(self) -> bool:
         """Validate that all required configuration is present."""
         try:
@@ -86,6 +104,7 @@ class Config:
         print(f"  Max Tokens: {self.max_tokens}")
         print(f"  Chunk Size: {self.chunk_size}")
         print(f"  Chunk Overlap: {self.chunk_overlap}")
+        print(f"  Max Concurrency: {self.max_concurrency}")
         print(f"  Database Host: {self.database_config.host}")
         print(f"  Database Port: {self.database_config.port}")
         print(f"  Database Name: {self.database_config.database}")
@@ -110,6 +129,7 @@ DB_PASSWORD=your_password_here
 MODEL_NAME=gpt-3.5-turbo
 TEMPERATURE=0.1
 MAX_TOKENS=2000
+MAX_CONCURRENCY=10
 
 # Text Processing Configuration
 CHUNK_SIZE=1000
@@ -0,0 +1,40 @@
+"""
+Long-lived event loop for running async extraction from synchronous code.
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Shared chat models keep their async HTTP connections bound to the loop that opened them, so every
+# synchronous entry point runs on this one loop instead of a fresh asyncio.run() loop per call
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="extraction-event-loop", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the background event loop and block until it returns.
+    
+    Safe to call from threads that already run their own event loop; must not be called from
+    a coroutine running on the background loop itself.
+    """
+    loop = get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the background event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
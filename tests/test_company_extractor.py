@@ -0,0 +1,117 @@
+"""
+Tests for paragraph splitting and packed extraction in the company extractor.
+"""
+import json
+import os
+import random
+import sys
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from extractors.company_extractor import CompanyExtractor
+
+
+class FakeChat(FakeListChatModel):
+    """Fake chat model replaying canned JSON responses through the structured-output chains."""
+    model_name: str = "fake-model"
+    temperature: float = 0.1
+    
+    def bind(self, **kwargs):
+        return self
+    
+    def with_structured_output(self, schema, **kwargs):
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+
+def packed_response(companies_by_index):
+    """Build a packed extraction response from {paragraph index: [company names]}."""
+    return json.dumps({"paragraphs": [
+        {
+            "index": index,
+            "companies": [{"company_name": name, "founding_date": None, "founders": []} for name in names]
+        }
+        for index, names in companies_by_index.items()
+    ]})
+
+
+def company_names(results):
+    return [[company.company_name for company in companies] for companies in results]
+
+
+def random_text(seed, sentences=80):
+    rng = random.Random(seed)
+    words = "alpha beta gamma delta epsilon zeta eta theta".split()
+    parts = []
+    for _ in range(sentences):
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(3, 40))).capitalize()
+        parts.append(sentence + rng.choice([". ", "! ", "? ", "\n", " "]))
+    if rng.random() < 0.3:
+        parts.append("x" * rng.randint(1, 2500))
+    return "".join(parts).strip()
+
+
+@pytest.mark.parametrize("seed", range(50))
+@pytest.mark.parametrize("max_chars, overlap", [(1000, 200), (300, 50), (200, 0), (100, 100), (100, 5000)])
+def test_fast_split_bounds_and_coverage(seed, max_chars, overlap):
+    text = random_text(seed)
+    chunks = CompanyExtractor._fast_split(text, max_chars, overlap)
+    
+    assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+    # Every word that fits in a chunk survives whole, and the last chunk ends where the text does
+    chunk_words = {word for chunk in chunks for word in chunk.split()}
+    assert {word for word in text.split() if len(word) <= max_chars} <= chunk_words
+    assert text.endswith(chunks[-1])
+    # Overlap is clamped to half a chunk, so each chunk moves well past the previous one
+    assert len(chunks) <= len(text) // (max_chars // 4) + 2
+
+
+def test_fast_split_breaks_on_lines_and_words():
+    bullets = "\n".join(f"- Item {i} is a list entry about Acme Holdings number {i}" for i in range(60))
+    for chunk in CompanyExtractor._fast_split(bullets):
+        assert chunk.startswith("- Item")
+        assert chunk.split()[-1].isdigit()
+    
+    words = " ".join(f"word{i}" for i in range(700))
+    chunks = CompanyExtractor._fast_split(words)
+    assert all(set(chunk.split()) <= set(words.split()) for chunk in chunks)
+    # Without sentence breaks the chunks still overlap
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.split()[0] in previous.split()
+
+
+def test_fast_split_short_text():
+    assert CompanyExtractor._fast_split("One sentence.") == ["One sentence."]
+    assert CompanyExtractor._fast_split("") == []
+
+
+def test_packed_results_map_back_to_input_positions():
+    # Packs are binned by length, so the long paragraph is sent in its own pack after the short ones
+    extractor = CompanyExtractor("sk-test", llm=FakeChat(responses=[
+        packed_response({0: ["Alpha"], 1: [], 2: ["Gamma", "Gamma Labs"]}),
+        packed_response({0: ["Long Co"]}),
+    ]))
+    paragraphs = ["Alpha para", "   ", "Nothing here", "L" * 600, "Gamma para"]
+    
+    results = extractor.extract_from_paragraphs_packed(paragraphs)
+    
+    assert company_names(results) == [["Alpha"], [], [], ["Long Co"], ["Gamma", "Gamma Labs"]]
+
+
+def test_packed_paragraphs_missing_from_response_are_retried_and_not_cached():
+    extractor = CompanyExtractor("sk-test", llm=FakeChat(responses=[
+        packed_response({0: ["Alpha"], 2: ["Gamma"]}),
+        packed_response({0: ["Beta"]}),
+        packed_response({1: ["Epsilon"]}),
+        packed_response({}),
+    ]))
+    
+    assert company_names(extractor.extract_from_paragraphs_packed(["A", "B", "C"])) == [["Alpha"], ["Beta"], ["Gamma"]]
+    # "D" is missing from both the first response and the retry
+    assert company_names(extractor.extract_from_paragraphs_packed(["D", "E"])) == [[], ["Epsilon"]]
+    assert extractor._cached_paragraph("D") is None
+    assert company_names([extractor._cached_paragraph("E")]) == [["Epsilon"]]
@@ -0,0 +1,97 @@
+"""
+Tests for founding date parsing and the ExtractedData container.
+"""
+import copy
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.company import CompanyData, ExtractedData, parse_founding_date
+
+DATES = [
+    ("1976", datetime(1976, 1, 1)),
+    (" 1976 ", datetime(1976, 1, 1)),
+    ("1976-04", datetime(1976, 4, 1)),
+    ("1976-4", datetime(1976, 4, 1)),
+    ("1976-04-01", datetime(1976, 4, 1)),
+    ("2020-01-02T03:04:05Z", datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)),
+    ("April 1, 1976", datetime(1976, 4, 1)),
+    ("1976-13", None),
+    ("not a date", None),
+    ("", None),
+    (None, None),
+    (1976, None),
+]
+
+
+@pytest.mark.parametrize("value, expected", DATES)
+def test_parse_founding_date(value, expected):
+    assert parse_founding_date(value) == expected
+
+
+def test_from_llm_parses_date_before_validation():
+    company = CompanyData.from_llm({"company_name": "Apple", "founding_date": "1976-04", "founders": None})
+    
+    assert company.founding_date == datetime(1976, 4, 1)
+    assert company.founders == []
+    assert CompanyData(company_name="Apple", founding_date="1976").founding_date == datetime(1976, 1, 1)
+
+
+def make_data():
+    data = ExtractedData()
+    data.add_company(CompanyData(company_name="Apple", founders=["Steve Jobs", "Steve Wozniak"]))
+    data.add_company(CompanyData(company_name="NeXT", founders=["Steve Jobs", "steve jobs"]))
+    return data
+
+
+def test_lookups_after_add_company():
+    data = make_data()
+    
+    assert data.total_companies == 2
+    assert data.model_dump()["total_companies"] == 2
+    assert [c.company_name for c in data.get_companies_by_name("APPLE")] == ["Apple"]
+    # A founder listed twice under different casing is indexed once per company
+    assert [c.company_name for c in data.get_companies_by_founder("steve JOBS")] == ["Apple", "NeXT"]
+    assert data.get_companies_by_founder("Bill Gates") == []
+
+
+def test_lookups_from_constructor():
+    data = ExtractedData(companies=[CompanyData(company_name="Apple", founders=["Steve Jobs"])])
+    
+    assert data.total_companies == 1
+    assert data.get_companies_by_founder("steve jobs")[0] is data.companies[0]
+
+
+@pytest.mark.parametrize("copier", [
+    lambda data: data.model_copy(deep=True),
+    lambda data: copy.deepcopy(data),
+    lambda data: data.model_copy(),
+])
+def test_lookups_after_copy(copier):
+    original = make_data()
+    copied = copier(original)
+    
+    copied.add_company(CompanyData(company_name="Pixar", founders=["Steve Jobs"]))
+    
+    assert copied.get_companies_by_name("apple")[0] is copied.companies[0]
+    assert [c.company_name for c in copied.get_companies_by_founder("steve jobs")] == ["Apple", "NeXT", "Pixar"]
+    assert all(any(c is company for company in copied.companies)
+               for c in copied.get_companies_by_founder("steve jobs"))
+
+
+def test_deep_copy_is_independent():
+    original = make_data()
+    copied = original.model_copy(deep=True)
+    
+    copied.companies[0].company_name = "Apple Inc."
+    copied.add_company(CompanyData(company_name="Pixar"))
+    
+    assert copied.get_companies_by_name("apple")[0] is copied.companies[0]
+    assert original.companies[0].company_name == "Apple"
+    assert original.total_companies == 2
+    assert original.get_companies_by_name("pixar") == []
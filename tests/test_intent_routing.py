@@ -0,0 +1,58 @@
+"""
+Tests for routing interactive requests to tools without invoking the LLM agent.
+"""
+import os
+import sys
+
+import pytest
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from agents.company_agent import match_intent
+
+ROUTED = [
+    ("list companies", "list", {"limit": None}),
+    ("Show all companies", "list", {"limit": None}),
+    ("list 5 companies.", "list", {"limit": "5"}),
+    ("show the companies?", "list", {"limit": None}),
+    ("search Apple", "search", {"term": "Apple"}),
+    ("find companies named 'Acme Corp'", "search", {"term": "Acme Corp"}),
+    ("search for companies founded by Steve Jobs", "search", {"term": "Steve Jobs"}),
+    ("Find Microsoft?", "search", {"term": "Microsoft"}),
+    ("details about Apple", "details", {"name": "Apple"}),
+    ("get details for \"OpenAI\"", "details", {"name": "OpenAI"}),
+    ("stats", "stats", {}),
+    ("Show the database statistics.", "stats", {}),
+]
+
+NOT_ROUTED = [
+    "Show companies founded by Steve Jobs",
+    "list companies that have no founding date",
+    "list all companies founded after 2000",
+    "find companies founded after 2000",
+    "Find the founders of Apple",
+    "find out which company Jobs founded",
+    "search for companies founded before 1990",
+    "details about Apple and Microsoft",
+    "details about Apple, Microsoft",
+    "What is the oldest company?",
+    "Who founded Google?",
+    "find companies",
+    "search companies",
+    "list 0 companies",
+]
+
+
+@pytest.mark.parametrize("user_input, intent, groups", ROUTED)
+def test_routed(user_input, intent, groups):
+    routed = match_intent(user_input)
+    assert routed is not None
+    assert routed[0] == intent
+    for group, value in groups.items():
+        assert routed[1][group] == value
+
+
+@pytest.mark.parametrize("user_input", NOT_ROUTED)
+def test_not_routed(user_input):
+    assert match_intent(user_input) is None